@@ -1,47 +1,27 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import plotly.figure_factory as ff
 from services import (
+    METADATA_COLUMNS,
     process_excel_file,
-    get_subject_list,
+    get_subject_list_from_columns,
     get_student_performance,
     get_dynamic_subject_recommendations,
     get_threshold_based_recommendations,
     get_subject_exam_types,
     get_subject_marks,
     get_subject_marks_summary,
-    extract_max_marks_from_header,
 )
-import re
 import numpy as np
 import json
 from datetime import datetime
 import io
 
-def _is_practical_col(col_name):
-    if not col_name or pd.isna(col_name):
-        return False
-    col_upper = str(col_name).upper()
-    if 'TW' in col_upper and 'PR' not in col_upper:
-        return False
-    return ('PRACTICAL' in col_upper) or (re.search(r'\bPR\b', col_upper) is not None)
-
-def _row_percentage(row, cols):
-    obtained_total = 0.0
-    max_total = 0.0
-    for c in cols:
-        val = row.get(c, np.nan)
-        try:
-            val = float(val)
-        except Exception:
-            val = np.nan
-        if pd.notna(val):
-            obtained_total += val
-            max_total += extract_max_marks_from_header(c)
-    return (obtained_total / max_total) * 100.0 if max_total > 0 else np.nan
+# orjson is optional; without it reports are serialized with the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def _get_max_marks_for_subject(subject_name, exam_type=None):
     """
@@ -63,15 +43,259 @@ def _get_max_marks_for_subject(subject_name, exam_type=None):
         # Default max marks for subject (sum of all exam types)
         return 100
 
-# Configure Streamlit page
-st.set_page_config(
-    page_title="GradeGraph - Student Analysis",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_process(file_bytes):
+    """
+    Parse and classify an uploaded workbook, memoized on its raw bytes
+    """
+    return process_excel_file(io.BytesIO(file_bytes))
 
-# CSS with black and blue theme (#0149ac)
-st.markdown("""
+@st.cache_data(show_spinner=False, max_entries=8)
+def _df_to_csv_bytes(df):
+    """
+    CSV download payload for a dataframe, serialized once per distinct frame
+    """
+    return df.to_csv(index=False).encode('utf-8')
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _analytics_summary(df_full, df_suggestions, total_subjects):
+    """
+    Analytics export summary, limited to the overall performance columns
+    """
+    stat_cols = [col for col in ['Academic_Performance_%', 'Practical_%'] if col in df_full.columns]
+    return {
+        'total_students': len(df_full),
+        'total_subjects': total_subjects,
+        'category_distribution': df_suggestions['Category'].value_counts().loc[lambda counts: counts > 0].to_dict() if 'Category' in df_suggestions.columns else {},
+        'performance_statistics': df_full[stat_cols].agg(['mean', 'std', 'min', 'max']).to_dict() if len(df_full) > 0 and stat_cols else {}
+    }
+
+def _report_json_bytes(report):
+    """
+    JSON download payload for a report dict; reports carry a generation
+    timestamp, so they are serialized directly rather than cached
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            report,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(report, indent=2, default=str).encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def _cached_subject_list(columns):
+    return get_subject_list_from_columns(columns)
+
+@st.cache_data(show_spinner=False)
+def _cached_subject_to_cols(columns):
+    # Uppercase each header once and drop metadata columns before matching subjects
+    exclude_words = ['ACADEMIC', 'PERFORMANCE', 'CODING', 'EXPERTISE', 'CATEGORY']
+    upper_cols = {}
+    for col in columns:
+        col_upper = str(col).upper()
+        if not any(word in col_upper for word in exclude_words):
+            upper_cols[col] = col_upper
+
+    subject_to_cols = {}
+    for subject in get_subject_list_from_columns(columns):
+        subject_upper = subject.upper()
+        subject_to_cols[subject] = [col for col, col_upper in upper_cols.items() if subject_upper in col_upper]
+    return subject_to_cols
+
+@st.cache_data(show_spinner=False)
+def _cached_subject_positions(columns):
+    # Reports match a subject against every non-metadata header, like the
+    # original per-report loops, and keep positions so a duplicated header
+    # contributes each of its columns exactly once
+    upper_cols = [(i, str(col).upper()) for i, col in enumerate(columns) if col not in METADATA_COLUMNS]
+    subject_positions = {}
+    for subject in get_subject_list_from_columns(columns):
+        subject_upper = subject.upper()
+        subject_positions[subject] = [i for i, col_upper in upper_cols if subject_upper in col_upper]
+    return subject_positions
+
+def _subject_list(df):
+    """
+    Subjects for a dataframe, cached on its column headers
+    """
+    return _cached_subject_list(tuple(df.columns))
+
+def _subject_to_cols(df):
+    """
+    Mapping of each subject to its assessment columns, cached on the column headers
+    """
+    return _cached_subject_to_cols(tuple(df.columns))
+
+def _subject_positions(df):
+    """
+    Mapping of each subject to the positions of its assessment columns, cached
+    on the column headers
+    """
+    return _cached_subject_positions(tuple(df.columns))
+
+def _topk(df, col, k, largest=True):
+    """
+    Rows holding the k largest (or smallest) values of col, sorted.
+    Uses a partial sort so only the selected rows are ordered; NaNs are skipped.
+    """
+    arr = df[col].to_numpy(dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(arr))
+    k = min(k, len(valid))
+    if k <= 0:
+        return df.iloc[:0]
+    keys = -arr[valid] if largest else arr[valid]
+    idx = np.sort(np.argpartition(keys, k - 1)[:k])
+    idx = idx[np.argsort(keys[idx], kind='stable')]
+    return df.iloc[valid[idx]]
+
+_BOX_POINTS_LIMIT = 5000
+
+def _performance_box(values, name, color):
+    """
+    Box trace for a column of percentages. Large cohorts are summarised into
+    precomputed quartiles and fences so only a handful of numbers reach the browser.
+    """
+    values = np.asarray(values, dtype=np.float32)
+    values = values[~np.isnan(values)]
+    if len(values) < _BOX_POINTS_LIMIT:
+        return go.Box(y=values, name=name, boxpoints='outliers', marker_color=color)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return go.Box(
+        x=[name],
+        q1=[q1],
+        median=[median],
+        q3=[q3],
+        lowerfence=[inside.min()],
+        upperfence=[inside.max()],
+        mean=[values.mean()],
+        name=name,
+        marker_color=color
+    )
+
+_CATEGORY_COLORS = {
+    'Bright': '#28a745',
+    'Average': '#ffc107',
+    'Weak': '#dc3545',
+    'Unknown': '#6c757d'
+}
+
+_DIFFICULTY_COLORS = {
+    'Easy': '#28a745',
+    'Moderate': '#ffc107',
+    'Difficult': '#dc3545'
+}
+
+_DIFFICULTY_THRESHOLDS = np.array([40, 60])
+_DIFFICULTY_LEVELS = np.array(['Difficult', 'Moderate', 'Easy'])
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _make_donut(counts, title, labels_inside=False):
+    """
+    Category donut chart for a tuple of (category, count) pairs, built once per
+    distinct set of counts
+    """
+    # plotly.express is slow to import, so load it only when a figure is built
+    import plotly.express as px
+    fig = px.pie(
+        values=[count for _, count in counts],
+        names=[category for category, _ in counts],
+        title=title,
+        hole=0.4,
+        color_discrete_map=_CATEGORY_COLORS
+    )
+    if labels_inside:
+        fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _make_difficulty_bar(rows):
+    """
+    Subject difficulty bar chart for a tuple of (subject, avg_marks, difficulty)
+    rows, built once per distinct set of rows
+    """
+    import plotly.express as px
+    fig = px.bar(
+        pd.DataFrame(list(rows), columns=['Subject', 'Avg_Marks', 'Difficulty']),
+        x='Subject',
+        y='Avg_Marks',
+        color='Difficulty',
+        title="📊 Subject Difficulty Analysis (by Marks - MSE + ESE)",
+        color_discrete_map=_DIFFICULTY_COLORS
+    )
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        yaxis_title="Average Marks (MSE + ESE)"
+    )
+    return fig
+
+def _category_counts(df):
+    """
+    Number of students per Category present in df, most common first
+    """
+    if 'Category' not in df.columns:
+        return pd.Series(dtype=int)
+    # Categorical value_counts lists every category; keep only those present
+    counts = df['Category'].value_counts()
+    return counts[counts > 0]
+
+def _subject_marks(df, subject_name):
+    """
+    Per-student MSE + ESE totals for a subject, memoised per loaded dataframe
+    """
+    cached = st.session_state.get('subject_marks_cache')
+    if cached is None or cached[0] is not df:
+        cached = (df, {})
+        st.session_state.subject_marks_cache = cached
+    if subject_name not in cached[1]:
+        cached[1][subject_name] = get_subject_marks(df, subject_name)
+    return cached[1][subject_name]
+
+def _performance_index(df):
+    """
+    Row positions of df ranked by Academic_Performance_% (NaNs last), plus the
+    Bright and Weak positions in that order. Computed once per loaded dataframe
+    and kept in session state so Top-K tables become slices.
+    """
+    cached = st.session_state.get('perf_index')
+    if cached is not None and cached[0] is df:
+        return cached[1]
+    perf = df['Academic_Performance_%'].to_numpy(dtype=np.float64)
+    order_desc = np.argsort(-np.where(np.isnan(perf), -np.inf, perf), kind='stable')
+    order_asc = np.argsort(perf, kind='stable')
+    if 'Category' in df.columns:
+        category = df['Category'].to_numpy()
+    else:
+        category = np.full(len(df), None, dtype=object)
+    index = {
+        'order_desc': order_desc,
+        'order_asc': order_asc,
+        'bright_idx': order_desc[category[order_desc] == 'Bright'],
+        'weak_idx': order_asc[category[order_asc] == 'Weak'],
+    }
+    st.session_state.perf_index = (df, index)
+    return index
+
+def _student_row(df, name):
+    """
+    Row of df for a student name, first match on duplicates. The Name index is
+    built once per loaded dataframe and kept in session state.
+    """
+    cached = st.session_state.get('df_by_name')
+    if cached is None or cached[0] is not df:
+        by_name = df.set_index('Name', drop=False)
+        if not by_name.index.is_unique:
+            by_name = by_name[~by_name.index.duplicated(keep='first')]
+        cached = (df, by_name)
+        st.session_state.df_by_name = cached
+    return cached[1].loc[name]
+
+# Static page markup kept as constants instead of inline literals. Streamlit
+# drops elements that are not re-emitted on a rerun, so they are still written
+# on every run rather than once per session.
+_CSS_HTML = """
 <style>
     /* Main App Background */
     .stApp {
@@ -171,10 +395,39 @@ st.markdown("""
         color: #f8d7da;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# Main title - GradeGraph
-st.markdown("""
+_DARK_MODE_CSS_HTML = """
+<style>
+    .stApp {
+        background-color: #1e1e1e;
+        color: #ffffff;
+    }
+    .main-header {
+        color: #ffffff !important;
+    }
+    .metric-card {
+        background: linear-gradient(135deg, #2d2d2d 0%, #1a1a1a 100%);
+        color: #ffffff;
+    }
+    .interactive-card {
+        background: #2d2d2d;
+        color: #ffffff;
+    }
+    .stButton > button {
+        background-color: #0149ac;
+        color: white;
+    }
+    .stButton > button:hover {
+        background-color: #013a8a;
+    }
+    .css-1d391kg {
+        background-color: #0149ac;
+    }
+</style>
+"""
+
+_TITLE_HTML = """
 <div style="text-align: center; margin-bottom: 2rem; padding: 2rem 0;">
     <h1 style="font-size: 4rem; font-weight: 800; color: #0149ac; margin: 0; letter-spacing: 2px; text-shadow: 2px 2px 8px rgba(1, 73, 172, 0.4);">
         🎓 GradeGraph
@@ -183,7 +436,135 @@ st.markdown("""
         Student Performance Analyzer
     </h3>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+def _bright_banner(bright, total):
+    """
+    Bright learners banner markup for the Upload and Dashboard pages
+    """
+    pct = bright / total * 100 if total else 0
+    return f"""
+<div style="text-align: center; margin: 2rem 0; padding: 1.5rem; background: linear-gradient(135deg, #28a745 0%, #20c997 100%); border-radius: 12px; box-shadow: 0 4px 12px rgba(40, 167, 69, 0.3);">
+    <h2 style="color: white; margin: 0; font-size: 2.5rem; font-weight: 700;">
+        🌟 {bright} BRIGHT LEARNERS
+    </h2>
+    <p style="color: rgba(255,255,255,0.9); margin: 0.5rem 0 0 0; font-size: 1.1rem;">
+        Out of {total} total students ({pct:.1f}%)
+    </p>
+</div>
+"""
+
+# Dashboard sections that own widgets (download buttons) run as fragments so
+# interacting with them reruns only that section, not the whole page
+@st.fragment
+def _matched_bright_learners(filtered_df, weak_count):
+    if 'Academic_Performance_%' in filtered_df.columns:
+        matched_top_count = min(weak_count, len(filtered_df)) if weak_count > 0 else 0
+        st.markdown(f"### 🏆 Bright Learners (Top {matched_top_count} matched to Weak)")
+
+        if matched_top_count > 0:
+            top_positions = _performance_index(filtered_df)['order_desc'][:matched_top_count]
+            bright_learners_matched = (
+                filtered_df.iloc[top_positions]
+                .loc[:, ['SR.No', 'Name', 'Academic_Performance_%', 'Category']]
+                .astype({'Academic_Performance_%': 'float32'})
+                .round({'Academic_Performance_%': 2})
+            )
+
+            # Add ranking
+            bright_learners_matched = bright_learners_matched.assign(Rank=np.arange(1, len(bright_learners_matched) + 1))
+            bright_learners_display = bright_learners_matched[['Rank', 'Name', 'Academic_Performance_%', 'Category']]
+
+            st.dataframe(
+                bright_learners_display,
+                use_container_width=True,
+                hide_index=True
+            )
+
+            csv_matched = bright_learners_matched.to_csv(index=False)
+            st.download_button(
+                "📥 Download Bright Learners (Matched)",
+                csv_matched,
+                "bright_learners_matched.csv",
+                "text/csv"
+            )
+        else:
+            st.info("No weak learners detected, so no matched Bright learners list to display.")
+    else:
+        st.info("Performance data not available")
+
+@st.fragment
+def _students_needing_attention(filtered_df):
+    st.markdown("### ⚠️ Students Needing Attention")
+    if 'Academic_Performance_%' in filtered_df.columns:
+        # Show ALL weak learners, sorted by lowest performance first
+        if 'Category' in filtered_df.columns:
+            weak_positions = _performance_index(filtered_df)['weak_idx']
+            if len(weak_positions) > 0:
+                weak_learners = (
+                    filtered_df.iloc[weak_positions]
+                    .loc[:, ['SR.No', 'Name', 'Academic_Performance_%', 'Category']]
+                    .astype({'Academic_Performance_%': 'float32'})
+                    .round({'Academic_Performance_%': 2})
+                )
+
+                # Add ranking
+                weak_learners = weak_learners.assign(Rank=np.arange(1, len(weak_learners) + 1))
+                weak_learners = weak_learners[['Rank', 'Name', 'Academic_Performance_%', 'Category']]
+
+                # Render only the weakest rows; the full list is available as CSV
+                weak_display = weak_learners.head(200)
+                st.dataframe(
+                    weak_display,
+                    use_container_width=True,
+                    hide_index=True,
+                    height=400,
+                    column_config={
+                        'Academic_Performance_%': st.column_config.ProgressColumn(
+                            'Academic_Performance_%',
+                            format="%.2f%%",
+                            min_value=0,
+                            max_value=100
+                        )
+                    }
+                )
+                if len(weak_learners) > len(weak_display):
+                    st.caption(f"Showing the {len(weak_display)} lowest of {len(weak_learners)} weak learners")
+
+                st.download_button(
+                    "📥 Download Students Needing Attention",
+                    weak_learners.to_csv(index=False),
+                    "weak_learners.csv",
+                    "text/csv"
+                )
+            else:
+                st.info("No weak students identified in the current dataset.")
+        else:
+            st.info("Category data not available to determine weak learners.")
+    else:
+        st.info("Performance data not available")
+
+@st.fragment
+def _theme_selector():
+    st.markdown("### 🎨 Theme")
+    theme = st.selectbox("Choose Theme", ["Default", "Dark Mode"])
+
+    # Apply theme-specific CSS
+    if theme == "Dark Mode":
+        st.markdown(_DARK_MODE_CSS_HTML, unsafe_allow_html=True)
+
+# Configure Streamlit page
+st.set_page_config(
+    page_title="GradeGraph - Student Analysis",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# CSS with black and blue theme (#0149ac)
+st.markdown(_CSS_HTML, unsafe_allow_html=True)
+
+# Main title - GradeGraph
+st.markdown(_TITLE_HTML, unsafe_allow_html=True)
 
 # Initialize session state
 if 'df_full' not in st.session_state:
@@ -211,40 +592,8 @@ page = st.sidebar.selectbox(
 
 # Simple theme selector
 st.sidebar.markdown("---")
-st.sidebar.markdown("### 🎨 Theme")
-theme = st.sidebar.selectbox("Choose Theme", ["Default", "Dark Mode"])
-
-# Apply theme-specific CSS
-if theme == "Dark Mode":
-    st.markdown("""
-    <style>
-        .stApp {
-            background-color: #1e1e1e;
-            color: #ffffff;
-        }
-        .main-header {
-            color: #ffffff !important;
-        }
-        .metric-card {
-            background: linear-gradient(135deg, #2d2d2d 0%, #1a1a1a 100%);
-            color: #ffffff;
-        }
-        .interactive-card {
-            background: #2d2d2d;
-            color: #ffffff;
-        }
-        .stButton > button {
-            background-color: #0149ac;
-            color: white;
-        }
-        .stButton > button:hover {
-            background-color: #013a8a;
-        }
-        .css-1d391kg {
-            background-color: #0149ac;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+with st.sidebar:
+    _theme_selector()
 
 # Simple data management section
 if st.session_state.get('df_full') is not None:
@@ -253,6 +602,17 @@ if st.session_state.get('df_full') is not None:
     if st.sidebar.button("🔄 Refresh Data", help="Reload and reprocess current data"):
         st.session_state.df_full = None
         st.session_state.df_suggestions = None
+        st.session_state.perf_index = None
+        st.session_state.subject_marks_cache = None
+        st.session_state.df_by_name = None
+        _cached_process.clear()
+        _df_to_csv_bytes.clear()
+        _analytics_summary.clear()
+        _make_donut.clear()
+        _make_difficulty_bar.clear()
+        _cached_subject_list.clear()
+        _cached_subject_to_cols.clear()
+        _cached_subject_positions.clear()
         st.rerun()
 
 
@@ -260,19 +620,18 @@ if st.session_state.get('df_full') is not None:
 if st.session_state.get('df_full') is not None and st.session_state.get('df_suggestions') is not None:
     df_full_sidebar = st.session_state.df_full
     df_sugg_sidebar = st.session_state.df_suggestions
+    cat_counts_sidebar = _category_counts(df_full_sidebar)
     with st.sidebar.expander("📊 Dashboard Snapshot", expanded=True):
         col_a, col_b = st.columns(2)
         with col_a:
             st.metric("Students", len(df_full_sidebar))
         with col_b:
-            st.metric("Subjects", len(get_subject_list(df_full_sidebar)))
+            st.metric("Subjects", len(_subject_list(df_full_sidebar)))
         col_c, col_d = st.columns(2)
         with col_c:
-            bright = (df_full_sidebar['Category'] == 'Bright').sum() if 'Category' in df_full_sidebar.columns else 0
-            st.metric("Bright", int(bright))
+            st.metric("Bright", int(cat_counts_sidebar.get('Bright', 0)))
         with col_d:
-            weak = (df_full_sidebar['Category'] == 'Weak').sum() if 'Category' in df_full_sidebar.columns else 0
-            st.metric("Weak", int(weak))
+            st.metric("Weak", int(cat_counts_sidebar.get('Weak', 0)))
 
 # File upload section
 if page == "📤 Upload":
@@ -285,7 +644,7 @@ if page == "📤 Upload":
     if uploaded_file:
         try:
             with st.spinner("🔄 Processing Excel file..."):
-                df_full, df_suggestions = process_excel_file(uploaded_file)
+                df_full, df_suggestions = _cached_process(uploaded_file.getvalue())
 
             # Store in session state
             st.session_state.df_full = df_full
@@ -294,30 +653,19 @@ if page == "📤 Upload":
             st.success("✅ File processed successfully!")
 
             # Calculate counts with debugging
+            cat_counts = _category_counts(df_full)
+            bright_count = int(cat_counts.get('Bright', 0))
+            weak_count = int(cat_counts.get('Weak', 0))
             if 'Category' in df_full.columns:
-                bright_count = len(df_full[df_full['Category'] == 'Bright'])
-                weak_count = len(df_full[df_full['Category'] == 'Weak'])
-                
                 # Debug information
                 st.info(f"🔍 Debug Info: Category column found. Bright: {bright_count}, Weak: {weak_count}")
-                st.info(f"Available categories: {df_full['Category'].value_counts().to_dict()}")
+                st.info(f"Available categories: {cat_counts.to_dict()}")
             else:
-                bright_count = 0
-                weak_count = 0
                 st.error("❌ Category column not found in dataframe!")
                 st.info(f"Available columns: {list(df_full.columns)}")
             
             # Prominent display of bright learners count
-            st.markdown(f"""
-            <div style="text-align: center; margin: 2rem 0; padding: 1.5rem; background: linear-gradient(135deg, #28a745 0%, #20c997 100%); border-radius: 12px; box-shadow: 0 4px 12px rgba(40, 167, 69, 0.3);">
-                <h2 style="color: white; margin: 0; font-size: 2.5rem; font-weight: 700;">
-                    🌟 {bright_count} BRIGHT LEARNERS
-                </h2>
-                <p style="color: rgba(255,255,255,0.9); margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-                    Out of {len(df_full)} total students ({bright_count/len(df_full)*100:.1f}% if len(df_full) > 0 else 0%)
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_bright_banner(bright_count, len(df_full)), unsafe_allow_html=True)
 
             # Display basic statistics (REMOVED avg and excellence scores)
             col1, col2, col3, col4 = st.columns(4)
@@ -326,15 +674,13 @@ if page == "📤 Upload":
                 st.metric("📚 Total Students", len(df_full))
 
             with col2:
-                subjects = get_subject_list(df_full)
+                subjects = _subject_list(df_full)
                 st.metric("📖 Subjects", len(subjects))
 
             with col3:
-                bright_count = len(df_full[df_full['Category'] == 'Bright']) if 'Category' in df_full.columns else 0
                 st.metric("🌟 Bright Learners", bright_count)
 
             with col4:
-                weak_count = len(df_full[df_full['Category'] == 'Weak']) if 'Category' in df_full.columns else 0
                 st.metric("⚠️ Weak Learners", weak_count)
 
             # Calculation Logic Explanation
@@ -369,32 +715,21 @@ elif page == "📈 Dashboard":
         st.header("📈 Performance Dashboard")
         
         # Calculate bright learners count with debugging
+        cat_counts = _category_counts(df_full)
+        bright_count = int(cat_counts.get('Bright', 0))
+        weak_count = int(cat_counts.get('Weak', 0))
         if 'Category' in df_full.columns:
-            bright_count = len(df_full[df_full['Category'] == 'Bright'])
-            weak_count = len(df_full[df_full['Category'] == 'Weak'])
-            
             # Debug information
             with st.expander("🔍 Debug Information", expanded=False):
                 st.info(f"Category column found. Bright: {bright_count}, Weak: {weak_count}")
-                st.info(f"Available categories: {df_full['Category'].value_counts().to_dict()}")
+                st.info(f"Available categories: {cat_counts.to_dict()}")
                 st.dataframe(df_full[['Name', 'Category', 'Academic_Performance_%']].head(10))
         else:
-            bright_count = 0
-            weak_count = 0
             st.error("❌ Category column not found in dataframe!")
             st.info(f"Available columns: {list(df_full.columns)}")
         
         # Prominent display of bright learners count
-        st.markdown(f"""
-        <div style="text-align: center; margin: 2rem 0; padding: 1.5rem; background: linear-gradient(135deg, #28a745 0%, #20c997 100%); border-radius: 12px; box-shadow: 0 4px 12px rgba(40, 167, 69, 0.3);">
-            <h2 style="color: white; margin: 0; font-size: 2.5rem; font-weight: 700;">
-                🌟 {bright_count} BRIGHT LEARNERS
-            </h2>
-            <p style="color: rgba(255,255,255,0.9); margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-                Out of {len(df_full)} total students ({bright_count/len(df_full)*100:.1f}% if len(df_full) > 0 else 0%)
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_bright_banner(bright_count, len(df_full)), unsafe_allow_html=True)
         
         # Key Performance Indicators
         col1, col2, col3, col4, col5 = st.columns(5)
@@ -408,7 +743,7 @@ elif page == "📈 Dashboard":
             )
         
         with col2:
-            subjects_count = len(get_subject_list(df_full))
+            subjects_count = len(_subject_list(df_full))
             st.metric(
                 "📚 Subjects", 
                 subjects_count,
@@ -427,7 +762,6 @@ elif page == "📈 Dashboard":
                 st.metric("📈 Avg Performance", "N/A")
         
         with col4:
-            bright_count = len(df_full[df_full['Category'] == 'Bright']) if 'Category' in df_full.columns else 0
             st.metric(
                 "🌟 Bright Students", 
                 bright_count,
@@ -436,7 +770,6 @@ elif page == "📈 Dashboard":
             )
         
         with col5:
-            weak_count = len(df_full[df_full['Category'] == 'Weak']) if 'Category' in df_full.columns else 0
             st.metric(
                 "⚠️ Weak Students", 
                 weak_count,
@@ -456,32 +789,23 @@ elif page == "📈 Dashboard":
 
         with col1:
             # Category distribution with donut chart
-            category_counts = df_suggestions['Category'].value_counts()
-            fig_donut = px.pie(
-                values=category_counts.values,
-                names=category_counts.index,
-                title="📊 Student Category Distribution",
-                hole=0.4,
-                color_discrete_map={
-                    'Bright': '#28a745',
-                    'Average': '#ffc107',
-                    'Weak': '#dc3545',
-                    'Unknown': '#6c757d'
-                }
+            fig_donut = _make_donut(
+                tuple((category, int(count)) for category, count in cat_counts.items()),
+                "📊 Student Category Distribution",
+                labels_inside=True
             )
-            fig_donut.update_traces(textposition='inside', textinfo='percent+label')
             st.plotly_chart(fig_donut, use_container_width=True)
 
         with col2:
             # Performance distribution with box plot
             if 'Academic_Performance_%' in filtered_df.columns:
-                fig_box = px.box(
-                    filtered_df,
-                    y='Academic_Performance_%',
-                    title="📈 Academic Performance Distribution",
-                    color_discrete_sequence=['#667eea']
-                )
+                fig_box = go.Figure(_performance_box(
+                    filtered_df['Academic_Performance_%'].to_numpy(),
+                    'Academic_Performance_%',
+                    '#667eea'
+                ))
                 fig_box.update_layout(
+                    title="📈 Academic Performance Distribution",
                     yaxis_title="Academic Performance %",
                     showlegend=False
                 )
@@ -495,62 +819,10 @@ elif page == "📈 Dashboard":
         col3, col4 = st.columns(2)
 
         with col3:
-            if 'Academic_Performance_%' in filtered_df.columns:
-                weak_count_matched = int((df_suggestions['Category'] == 'Weak').sum())
-                matched_top_count = min(weak_count_matched, len(filtered_df)) if weak_count_matched > 0 else 0
-                st.markdown(f"### 🏆 Bright Learners (Top {matched_top_count} matched to Weak)")
-
-                if matched_top_count > 0:
-                    bright_learners_matched = filtered_df.nlargest(matched_top_count, 'Academic_Performance_%')[['SR.No', 'Name', 'Academic_Performance_%', 'Category']].copy()
-                    bright_learners_matched['Academic_Performance_%'] = bright_learners_matched['Academic_Performance_%'].round(2)
-
-                    # Add ranking
-                    bright_learners_matched['Rank'] = range(1, len(bright_learners_matched) + 1)
-                    bright_learners_display = bright_learners_matched[['Rank', 'Name', 'Academic_Performance_%', 'Category']]
-
-                    st.dataframe(
-                        bright_learners_display,
-                        use_container_width=True,
-                        hide_index=True
-                    )
-
-                    csv_matched = bright_learners_matched.to_csv(index=False)
-                    st.download_button(
-                        "📥 Download Bright Learners (Matched)",
-                        csv_matched,
-                        "bright_learners_matched.csv",
-                        "text/csv"
-                    )
-                else:
-                    st.info("No weak learners detected, so no matched Bright learners list to display.")
-            else:
-                st.info("Performance data not available")
+            _matched_bright_learners(filtered_df, weak_count)
 
         with col4:
-            st.markdown("### ⚠️ Students Needing Attention")
-            if 'Academic_Performance_%' in filtered_df.columns:
-                # Show ALL weak learners, sorted by lowest performance first
-                if 'Category' in filtered_df.columns:
-                    weak_learners = filtered_df[filtered_df['Category'] == 'Weak'][['SR.No', 'Name', 'Academic_Performance_%', 'Category']]
-                    if len(weak_learners) > 0:
-                        weak_learners = weak_learners.sort_values('Academic_Performance_%', ascending=True).copy()
-                        weak_learners['Academic_Performance_%'] = weak_learners['Academic_Performance_%'].round(2)
-
-                        # Add ranking
-                        weak_learners['Rank'] = range(1, len(weak_learners) + 1)
-                        weak_learners = weak_learners[['Rank', 'Name', 'Academic_Performance_%', 'Category']]
-
-                        st.dataframe(
-                            weak_learners,
-                            use_container_width=True,
-                            hide_index=True
-                        )
-                    else:
-                        st.info("No weak students identified in the current dataset.")
-                else:
-                    st.info("Category data not available to determine weak learners.")
-            else:
-                st.info("Performance data not available")
+            _students_needing_attention(filtered_df)
 
     else:
         st.warning("📤 Please upload and process an Excel file first.")
@@ -659,7 +931,7 @@ elif page == "👥 Students":
 elif page == "📊 Subjects":
     if st.session_state.df_full is not None:
         df_full = st.session_state.df_full
-        subjects = get_subject_list(df_full)
+        subjects = _subject_list(df_full)
 
         st.header("📊 Subject-wise Analysis")
 
@@ -668,33 +940,20 @@ elif page == "📊 Subjects":
 
             if selected_subject:
                 # Get all columns for the selected subject
-                subject_cols = []
-                for col in df_full.columns:
-                    # More flexible subject matching
-                    col_upper = col.upper()
-                    subject_upper = selected_subject.upper()
-
-                    # Check if column starts with subject name or contains it
-                    if (col_upper.startswith(subject_upper) or
-                        subject_upper in col_upper):
-                        # Make sure it's actually a subject column, not metadata
-                        exclude_words = ['ACADEMIC', 'PERFORMANCE', 'CODING', 'EXPERTISE', 'CATEGORY']
-                        if not any(word in col_upper for word in exclude_words):
-                            subject_cols.append(col)
+                subject_cols = _subject_to_cols(df_full).get(selected_subject, [])
 
                 if subject_cols:
                     st.subheader(f"📈 Analysis for {selected_subject}")
 
                     # Calculate subject statistics using marks (MSE + ESE)
-                    subject_marks = get_subject_marks(df_full, selected_subject)
+                    subject_marks = _subject_marks(df_full, selected_subject)
                     
-                    if subject_marks:
+                    if subject_marks is not None and len(subject_marks) > 0:
                         # Create subject data with marks
-                        subject_data = df_full[['Name', 'SR.No', 'Category']].copy()
-                        subject_data['Subject_Marks'] = subject_marks
+                        subject_data = df_full[['Name', 'SR.No', 'Category']].assign(Subject_Marks=subject_marks)
                         
                         # Get summary statistics
-                        marks_summary = get_subject_marks_summary(df_full, selected_subject)
+                        marks_summary = get_subject_marks_summary(df_full, selected_subject, marks_data=subject_marks)
                         
                         # Display summary metrics
                         col_summary1, col_summary2, col_summary3, col_summary4 = st.columns(4)
@@ -716,19 +975,17 @@ elif page == "📊 Subjects":
 
                         with col1:
                             st.subheader(f"🏆 Top Performers in {selected_subject}")
-                            top_subject = subject_data.nlargest(10, 'Subject_Marks')[['SR.No', 'Name', 'Subject_Marks']]
-                            top_subject['Subject_Marks'] = top_subject['Subject_Marks'].round(1)
+                            top_subject = _topk(subject_data, 'Subject_Marks', 10).loc[:, ['SR.No', 'Name', 'Subject_Marks']].round({'Subject_Marks': 1})
                             # Add ranking
-                            top_subject['Rank'] = range(1, len(top_subject) + 1)
+                            top_subject = top_subject.assign(Rank=np.arange(1, len(top_subject) + 1))
                             top_subject = top_subject[['Rank', 'Name', 'Subject_Marks']]
                             st.dataframe(top_subject, use_container_width=True, hide_index=True)
 
                         with col2:
                             st.subheader(f"⚠️ Need Improvement in {selected_subject}")
-                            bottom_subject = subject_data.nsmallest(10, 'Subject_Marks')[['SR.No', 'Name', 'Subject_Marks']]
-                            bottom_subject['Subject_Marks'] = bottom_subject['Subject_Marks'].round(1)
+                            bottom_subject = _topk(subject_data, 'Subject_Marks', 10, largest=False).loc[:, ['SR.No', 'Name', 'Subject_Marks']].round({'Subject_Marks': 1})
                             # Add ranking
-                            bottom_subject['Rank'] = range(1, len(bottom_subject) + 1)
+                            bottom_subject = bottom_subject.assign(Rank=np.arange(1, len(bottom_subject) + 1))
                             bottom_subject = bottom_subject[['Rank', 'Name', 'Subject_Marks']]
                             st.dataframe(bottom_subject, use_container_width=True, hide_index=True)
                     else:
@@ -759,7 +1016,7 @@ elif page == "🎯 Insights":
             st.metric("👥 Total Students", total_students)
 
         with col2:
-            subjects_count = len(get_subject_list(df_full))
+            subjects_count = len(_subject_list(df_full))
             st.metric("📚 Total Subjects", subjects_count)
 
         with col3:
@@ -775,23 +1032,15 @@ elif page == "🎯 Insights":
         # Category analysis
         st.subheader("📈 Category-wise Analysis")
 
-        category_stats = df_full['Category'].value_counts() if 'Category' in df_full.columns else pd.Series()
+        category_stats = _category_counts(df_full)
 
         col5, col6 = st.columns(2)
 
         with col5:
             # Category distribution with recommendations
-            fig_donut = px.pie(
-                values=category_stats.values,
-                names=category_stats.index,
-                title="🎯 Student Distribution by Performance Category",
-                hole=0.4,
-                color_discrete_map={
-                    'Bright': '#28a745',
-                    'Average': '#ffc107',
-                    'Weak': '#dc3545',
-                    'Unknown': '#6c757d'
-                }
+            fig_donut = _make_donut(
+                tuple((category, int(count)) for category, count in category_stats.items()),
+                "🎯 Student Distribution by Performance Category"
             )
             st.plotly_chart(fig_donut, use_container_width=True)
 
@@ -814,60 +1063,43 @@ elif page == "🎯 Insights":
                     st.write("🆘 Require immediate attention and support")
 
         # Subject difficulty analysis
-        subjects = get_subject_list(df_full)
+        subjects = _subject_list(df_full)
         if subjects:
             st.subheader("📚 Subject Difficulty Analysis")
 
-            subject_difficulty = []
+            # Assuming max possible marks for MSE+ESE is 85 (25+60)
+            max_possible_marks = 85
+            rated_subjects = []
+            avg_marks = []
+            fail_rates = []
             for subject in subjects:
-                subject_cols = []
-                for col in df_full.columns:
-                    col_upper = col.upper()
-                    subject_upper = subject.upper()
-
-                    if (col_upper.startswith(subject_upper) or subject_upper in col_upper):
-                        exclude_words = ['ACADEMIC', 'PERFORMANCE', 'CODING', 'EXPERTISE', 'CATEGORY']
-                        if not any(word in col_upper for word in exclude_words):
-                            if df_full[col].dtype in ['int64', 'float64']:
-                                subject_cols.append(col)
-
                 # Calculate marks for this subject (MSE + ESE only)
-                subject_marks = get_subject_marks(df_full, subject)
+                subject_marks = _subject_marks(df_full, subject)
                 
-                if subject_marks:
-                    avg_marks = np.mean(subject_marks)
-                    # Assuming max possible marks for MSE+ESE is 85 (25+60)
-                    max_possible_marks = 85
-                    fail_rate = (np.array(subject_marks) < (max_possible_marks * 0.4)).sum() / len(subject_marks) * 100
-
-                    difficulty_level = "Easy" if avg_marks >= 60 else "Moderate" if avg_marks >= 40 else "Difficult"
-
-                    subject_difficulty.append({
-                        'Subject': subject,
-                        'Avg_Marks': round(avg_marks, 2),
-                        'Fail_Rate': round(fail_rate, 1),
-                        'Difficulty': difficulty_level
-                    })
+                if subject_marks is not None and len(subject_marks) > 0:
+                    rated_subjects.append(subject)
+                    avg_marks.append(float(subject_marks.mean()))
+                    fail_rates.append(float((subject_marks < max_possible_marks * 0.4).mean()) * 100)
+
+            # Below 40 is Difficult, 40 up to 60 Moderate, 60 and above Easy
+            difficulty_levels = _DIFFICULTY_LEVELS[np.searchsorted(_DIFFICULTY_THRESHOLDS, avg_marks, side='right')]
+
+            subject_difficulty = [
+                {
+                    'Subject': subject,
+                    'Avg_Marks': round(avg, 2),
+                    'Fail_Rate': round(fail_rate, 1),
+                    'Difficulty': str(difficulty_level)
+                }
+                for subject, avg, fail_rate, difficulty_level in zip(rated_subjects, avg_marks, fail_rates, difficulty_levels)
+            ]
 
             if subject_difficulty:
                 difficulty_df = pd.DataFrame(subject_difficulty).sort_values('Avg_Marks')
 
                 # Difficulty visualization
-                fig_difficulty = px.bar(
-                    difficulty_df,
-                    x='Subject',
-                    y='Avg_Marks',
-                    color='Difficulty',
-                    title="📊 Subject Difficulty Analysis (by Marks - MSE + ESE)",
-                    color_discrete_map={
-                        'Easy': '#28a745',
-                        'Moderate': '#ffc107',
-                        'Difficult': '#dc3545'
-                    }
-                )
-                fig_difficulty.update_layout(
-                    xaxis_tickangle=-45,
-                    yaxis_title="Average Marks (MSE + ESE)"
+                fig_difficulty = _make_difficulty_bar(
+                    tuple(difficulty_df[['Subject', 'Avg_Marks', 'Difficulty']].itertuples(index=False, name=None))
                 )
                 st.plotly_chart(fig_difficulty, use_container_width=True)
 
@@ -904,7 +1136,7 @@ elif page == "🎯 Insights":
 
         # Based on pass rate
         if 'Academic_Performance_%' in df_full.columns:
-            pass_count = len(df_full[df_full['Academic_Performance_%'] >= 40])
+            pass_count = int((df_full['Academic_Performance_%'].to_numpy() >= 40).sum())
             pass_rate = (pass_count / len(df_full)) * 100 if len(df_full) > 0 else 0
             avg_academic = df_full['Academic_Performance_%'].mean()
 
@@ -921,21 +1153,17 @@ elif page == "🎯 Insights":
 
         # Display recommendations
         if recommendations:
+            # One heading and one alert per recommendation; the alert carries both
+            # the issue and the action instead of emitting them as separate elements
+            priority_alerts = {
+                'High': (st.error, '🚨'),
+                'Medium': (st.warning, '⚠️'),
+            }
             for i, rec in enumerate(recommendations):
-                priority_color = 'error' if rec['Priority'] == 'High' else 'warning' if rec['Priority'] == 'Medium' else 'info'
-
-                with st.container():
-                    st.markdown(f"### {i+1}. {rec['Area']} - {rec['Priority']} Priority")
-                    if rec['Priority'] == 'High':
-                        st.error(f"🚨 **Issue**: {rec['Recommendation']}")
-                        st.error(f"🎯 **Action**: {rec['Action']}")
-                    elif rec['Priority'] == 'Medium':
-                        st.warning(f"⚠️ **Issue**: {rec['Recommendation']}")
-                        st.warning(f"🎯 **Action**: {rec['Action']}")
-                    else:
-                        st.info(f"ℹ️ **Issue**: {rec['Recommendation']}")
-                        st.info(f"🎯 **Action**: {rec['Action']}")
-                    st.markdown("---")
+                alert, icon = priority_alerts.get(rec['Priority'], (st.info, 'ℹ️'))
+                st.markdown(f"### {i+1}. {rec['Area']} - {rec['Priority']} Priority")
+                alert(f"{icon} **Issue**: {rec['Recommendation']}\n\n🎯 **Action**: {rec['Action']}")
+            st.markdown("---")
         else:
             st.success("🎉 Great! No critical issues identified. Keep up the good work!")
 
@@ -956,8 +1184,7 @@ elif page == "🎯 Insights":
             }
 
             # Convert to JSON for download
-            import json
-            report_json = json.dumps(report_data, indent=2, default=str)
+            report_json = _report_json_bytes(report_data)
 
             st.download_button(
                 "📥 Download Detailed Report (JSON)",
@@ -979,6 +1206,10 @@ elif page == "📋 Reports":
         df_full = st.session_state.df_full
         df_suggestions = st.session_state.df_suggestions
         
+        # Subjects and their columns, looked up once for every report below
+        subjects = _subject_list(df_full)
+        subject_positions = _subject_positions(df_full)
+        
         st.header("📋 Reports & Export Center")
         
         # Report type selection
@@ -1004,7 +1235,7 @@ elif page == "📋 Reports":
                         'report_metadata': {
                             'generated_at': datetime.now().isoformat(),
                             'total_students': len(df_full),
-                            'total_subjects': len(get_subject_list(df_full)),
+                            'total_subjects': len(subjects),
                             'report_type': 'Comprehensive Analysis'
                         },
                         'summary_statistics': {},
@@ -1015,37 +1246,48 @@ elif page == "📋 Reports":
                     
                     # Summary statistics
                     if 'Academic_Performance_%' in df_full.columns:
-                        avg_academic = df_full['Academic_Performance_%'].mean()
+                        # Pull the column out once and reduce the plain array
+                        academic = df_full['Academic_Performance_%'].to_numpy(dtype=np.float64)
+                        academic = academic[~np.isnan(academic)]
+                        has_values = len(academic) > 0
                         report_data['summary_statistics'] = {
-                            'average_academic_performance': float(avg_academic),
-                            'median_academic_performance': float(df_full['Academic_Performance_%'].median()),
-                            'std_academic_performance': float(df_full['Academic_Performance_%'].std()),
-                            'min_academic_performance': float(df_full['Academic_Performance_%'].min()),
-                            'max_academic_performance': float(df_full['Academic_Performance_%'].max())
+                            'average_academic_performance': float(academic.mean()) if has_values else float('nan'),
+                            'median_academic_performance': float(np.median(academic)) if has_values else float('nan'),
+                            'std_academic_performance': float(academic.std(ddof=1)) if len(academic) > 1 else float('nan'),
+                            'min_academic_performance': float(academic.min()) if has_values else float('nan'),
+                            'max_academic_performance': float(academic.max()) if has_values else float('nan')
                         }
                     
                     # Category analysis
                     if 'Category' in df_suggestions.columns:
-                        category_counts = df_suggestions['Category'].value_counts()
+                        category_counts = df_suggestions['Category'].value_counts().loc[lambda counts: counts > 0]
                         report_data['category_analysis'] = category_counts.to_dict()
                     
                     # Subject analysis
-                    subjects = get_subject_list(df_full)
+                    subject_groups = [(subject, positions) for subject, positions in subject_positions.items() if positions]
                     subject_analysis = {}
-                    for subject in subjects:
-                        subject_cols = [col for col in df_full.columns if subject.upper() in col.upper()]
-                        if subject_cols:
-                            subject_data = df_full[subject_cols].mean(axis=1)
+                    if subject_groups:
+                        # Read every subject column in one block, then average each student's
+                        # marks per subject with one segmented reduction over the column groups
+                        block = df_full.iloc[:, [i for _, positions in subject_groups for i in positions]].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+                        starts = np.cumsum([0] + [len(positions) for _, positions in subject_groups[:-1]])
+                        valid = ~np.isnan(block)
+                        sums = np.add.reduceat(np.where(valid, block, 0.0), starts, axis=1)
+                        counts = np.add.reduceat(valid, starts, axis=1)
+                        with np.errstate(divide='ignore', invalid='ignore'):
+                            student_means = pd.DataFrame(sums / counts, columns=[subject for subject, _ in subject_groups])
+                        subject_stats = student_means.agg(['mean', 'std'])
+                        for subject, _ in subject_groups:
                             subject_analysis[subject] = {
-                                'average_performance': float(subject_data.mean()),
-                                'std_performance': float(subject_data.std()),
-                                'total_students': len(subject_data)
+                                'average_performance': float(subject_stats.at['mean', subject]),
+                                'std_performance': float(subject_stats.at['std', subject]),
+                                'total_students': len(student_means)
                             }
                     report_data['subject_analysis'] = subject_analysis
                     
                     # Generate recommendations
                     if 'Academic_Performance_%' in df_full.columns:
-                        weak_students = len(df_full[df_full['Academic_Performance_%'] < 60])
+                        weak_students = int((df_full['Academic_Performance_%'].to_numpy() < 60).sum())
                         if weak_students > 0:
                             report_data['recommendations'].append({
                                 'priority': 'High',
@@ -1066,7 +1308,7 @@ elif page == "📋 Reports":
                     
                     with col1:
                         # JSON download
-                        json_data = json.dumps(report_data, indent=2, default=str)
+                        json_data = _report_json_bytes(report_data)
                         st.download_button(
                             "📥 Download JSON Report",
                             json_data,
@@ -1076,7 +1318,7 @@ elif page == "📋 Reports":
                     
                     with col2:
                         # CSV download
-                        csv_data = df_full.to_csv(index=False)
+                        csv_data = _df_to_csv_bytes(df_full)
                         st.download_button(
                             "📊 Download Full Data CSV",
                             csv_data,
@@ -1086,7 +1328,7 @@ elif page == "📋 Reports":
                     
                     with col3:
                         # Summary CSV download
-                        summary_csv = df_suggestions.to_csv(index=False)
+                        summary_csv = _df_to_csv_bytes(df_suggestions)
                         st.download_button(
                             "📋 Download Summary CSV",
                             summary_csv,
@@ -1102,7 +1344,7 @@ elif page == "📋 Reports":
                 selected_student = st.selectbox("Select Student", df_full['Name'].tolist())
                 
                 if selected_student:
-                    student_data = df_full[df_full['Name'] == selected_student].iloc[0]
+                    student_data = _student_row(df_full, selected_student)
                     
                     # Generate individual report
                     if st.button("📄 Generate Student Report", type="primary"):
@@ -1125,19 +1367,15 @@ elif page == "📋 Reports":
                             }
                             
                             # Subject-wise performance
-                            subjects = get_subject_list(df_full)
-                            for subject in subjects:
-                                subject_cols = [col for col in df_full.columns if subject.upper() in col.upper()]
-                                if subject_cols:
-                                    subject_scores = []
-                                    for col in subject_cols:
-                                        score = student_data.get(col, 0)
-                                        if pd.notna(score) and score > 0:
-                                            subject_scores.append(float(score))
+                            for subject, positions in subject_positions.items():
+                                if positions:
+                                    # Coerce the student's subject cells together, keeping only marks actually scored
+                                    subject_values = pd.to_numeric(student_data.iloc[positions], errors='coerce').dropna()
+                                    subject_scores = subject_values[subject_values > 0].astype(float).tolist()
                                     
                                     if subject_scores:
                                         student_report['subject_wise_performance'][subject] = {
-                                            'average_score': float(np.mean(subject_scores)),
+                                            'average_score': sum(subject_scores) / len(subject_scores),
                                             'total_scores': subject_scores,
                                             'max_possible': len(subject_scores) * 100  # Assuming max 100 per assessment
                                         }
@@ -1167,7 +1405,7 @@ elif page == "📋 Reports":
                                 st.json(student_report)
                             
                             # Download student report
-                            json_data = json.dumps(student_report, indent=2, default=str)
+                            json_data = _report_json_bytes(student_report)
                             st.download_button(
                                 "📥 Download Student Report",
                                 json_data,
@@ -1183,7 +1421,7 @@ elif page == "📋 Reports":
         
         with col1:
             if st.button("📊 Export All Data", help="Export complete dataset"):
-                csv_data = df_full.to_csv(index=False)
+                csv_data = _df_to_csv_bytes(df_full)
                 st.download_button(
                     "📥 Download Complete Dataset",
                     csv_data,
@@ -1193,7 +1431,7 @@ elif page == "📋 Reports":
         
         with col2:
             if st.button("📋 Export Summary", help="Export summary data"):
-                summary_data = df_suggestions.to_csv(index=False)
+                summary_data = _df_to_csv_bytes(df_suggestions)
                 st.download_button(
                     "📥 Download Summary Data",
                     summary_data,
@@ -1204,14 +1442,9 @@ elif page == "📋 Reports":
         with col3:
             if st.button("📈 Export Analytics", help="Export analytics data"):
                 # Create analytics summary
-                analytics_data = {
-                    'total_students': len(df_full),
-                    'total_subjects': len(get_subject_list(df_full)),
-                    'category_distribution': df_suggestions['Category'].value_counts().to_dict() if 'Category' in df_suggestions.columns else {},
-                    'performance_statistics': df_full.describe().to_dict() if len(df_full) > 0 else {}
-                }
+                analytics_data = _analytics_summary(df_full, df_suggestions, len(subjects))
                 
-                analytics_json = json.dumps(analytics_data, indent=2, default=str)
+                analytics_json = _report_json_bytes(analytics_data)
                 st.download_button(
                     "📥 Download Analytics Data",
                     analytics_json,
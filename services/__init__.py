@@ -1,5 +1,5 @@
 from .processing import process_excel_file
-from .subjects import get_subject_list, get_subject_exam_types, get_subject_marks, get_subject_marks_summary
+from .subjects import METADATA_COLUMNS, get_subject_list, get_subject_list_from_columns, get_subject_exam_types, get_subject_marks, get_subject_marks_summary
 from .students import get_student_performance
 from .recommendations import (
     get_dynamic_subject_recommendations,
@@ -13,7 +13,9 @@ from .utils import extract_max_marks_from_header, is_practical_column
 
 __all__ = [
     'process_excel_file',
+    'METADATA_COLUMNS',
     'get_subject_list',
+    'get_subject_list_from_columns',
     'get_subject_exam_types',
     'get_subject_marks',
     'get_subject_marks_summary',
@@ -0,0 +1,49 @@
+import numpy as np
+
+# Numba is optional; without it the kernels fall back to plain NumPy reductions
+try:
+    import numba as nb
+    HAS_NUMBA = True
+except ImportError:
+    nb = None
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+    @nb.njit(cache=True)
+    def _row_percentage_jit(obtained, max_marks):
+        n_rows, n_cols = obtained.shape
+        out = np.empty(n_rows, dtype=np.float64)
+        for i in range(n_rows):
+            total_obtained = 0.0
+            total_maximum = 0.0
+            for j in range(n_cols):
+                value = obtained[i, j]
+                if np.isfinite(value):
+                    total_obtained += value
+                    total_maximum += max_marks[j]
+            out[i] = total_obtained / total_maximum * 100.0 if total_maximum > 0 else 0.0
+        return out
+
+
+def row_percentage(obtained, max_marks):
+    """
+    Percentage of obtained vs maximum marks for each row of a 2D marks array.
+    Non-finite cells contribute to neither total; rows with no marks get 0.
+    """
+    obtained = np.ascontiguousarray(obtained, dtype=np.float64)
+    max_marks = np.ascontiguousarray(max_marks, dtype=np.float64)
+    # The compiled kernel does not bounds-check, so mismatched widths must not reach it
+    if obtained.ndim != 2 or max_marks.shape != (obtained.shape[1],):
+        raise ValueError(
+            f"row_percentage needs one max mark per column: got marks of shape {obtained.shape} "
+            f"and max marks of shape {max_marks.shape}"
+        )
+    if HAS_NUMBA:
+        return _row_percentage_jit(obtained, max_marks)
+
+    mask = np.isfinite(obtained)
+    total_obtained = np.where(mask, obtained, 0).sum(axis=1)
+    total_maximum = (mask * max_marks).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total_maximum > 0, total_obtained / total_maximum * 100.0, 0.0)
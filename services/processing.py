@@ -1,14 +1,24 @@
 import io
 import re
+import numpy as np
 import pandas as pd
 from openpyxl import load_workbook
 
 from .utils import extract_max_marks_from_header, is_practical_column
+from ._kernels import row_percentage
 
+# Prefer the Rust-based calamine reader for the bulk data read when available
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
 
-def find_data_start_row(file_obj, sheet_name=0):
+
+def find_data_start_row(file_obj, sheet_name=0, wb=None):
     try:
-        wb = load_workbook(file_obj)
+        if wb is None:
+            wb = load_workbook(file_obj)
         ws = wb.active if sheet_name == 0 else wb[sheet_name]
 
         for row in range(1, 31):
@@ -31,9 +41,10 @@ def find_data_start_row(file_obj, sheet_name=0):
         return 7
 
 
-def extract_subject_info(file_obj, sheet_name=0):
+def extract_subject_info(file_obj, sheet_name=0, wb=None):
     try:
-        wb = load_workbook(file_obj)
+        if wb is None:
+            wb = load_workbook(file_obj)
         ws = wb.active if sheet_name == 0 else wb[sheet_name]
 
         subjects = {}
@@ -94,6 +105,57 @@ def is_valid_number(value):
         return False
 
 
+def _batch_row_percentage(df, cols, max_marks_by_col):
+    """
+    Percentage of obtained vs maximum marks per row over the given columns.
+    Blank cells contribute to neither total; rows with no marks get 0.
+    Columns are picked by position so a duplicated header counts each of its
+    columns once, each paired with its own max marks.
+    """
+    wanted = set(cols)
+    positions = [i for i, col in enumerate(df.columns) if col in wanted]
+    maxv = np.array([max_marks_by_col[df.columns[i]] for i in positions], dtype=np.float64)
+    vals = df.iloc[:, positions].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    return np.round(row_percentage(vals, maxv), 2)
+
+
+_IDENTIFIER_COLUMNS = ['SR.No', 'Roll No', 'Sr_No', 'Roll_No']
+
+
+def downcast_numeric_columns(df):
+    """
+    Store float mark columns as float32 when every value survives the round
+    trip exactly, halving the bytes copied into every table and chart.
+    Identifier and integer columns are left alone, and columns holding
+    decimals float32 cannot represent (e.g. 22.3 or 2-decimal percentages)
+    stay float64 so reports and exports show the values read from the sheet.
+    """
+    for col in df.select_dtypes(include=['float64']).columns:
+        if col in _IDENTIFIER_COLUMNS:
+            continue
+        values = df[col].to_numpy()
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            df[col] = narrowed
+    return df
+
+
+CATEGORY_LEVELS = ['Bright', 'Average', 'Weak', 'Unknown']
+
+
+def categorize_label_columns(df):
+    """
+    Store the repeated Category and Coding_Expertise labels as categoricals so
+    counts and comparisons work on small integer codes. Category always carries
+    the full set of classifier labels, whichever of them occur in the sheet.
+    """
+    if 'Category' in df.columns:
+        df['Category'] = pd.Categorical(df['Category'], categories=CATEGORY_LEVELS)
+    if 'Coding_Expertise' in df.columns:
+        df['Coding_Expertise'] = df['Coding_Expertise'].astype('category')
+    return df
+
+
 def calculate_performance_metrics(df):
     print("\n" + "="*60)
     print("CALCULATING PERFORMANCE METRICS (GRADE GRAPH)")
@@ -101,6 +163,7 @@ def calculate_performance_metrics(df):
 
     student_info_cols = ['Sr_No', 'Roll_No', 'Student_Name']
     all_subject_cols = [col for col in df.columns if col not in student_info_cols]
+    upper_cols = {col: str(col).upper() for col in all_subject_cols}
 
     print("\n🔍 ANALYZING COLUMNS FOR PRACTICAL DETECTION:")
     practical_cols = []
@@ -108,36 +171,25 @@ def calculate_performance_metrics(df):
         if is_practical_column(col):
             practical_cols.append(col)
 
-    theory_cols = [col for col in all_subject_cols if col not in practical_cols and any(keyword in str(col).upper() for keyword in ['ISE', 'MSE', 'ESE'])]
+    theory_cols = [col for col in all_subject_cols if col not in practical_cols and any(keyword in upper_cols[col] for keyword in ['ISE', 'MSE', 'ESE'])]
 
     print(f"\n📊 COLUMN CLASSIFICATION RESULTS:")
     print(f"Found {len(theory_cols)} theory columns and {len(practical_cols)} practical columns")
     print(f"Theory columns: {theory_cols[:5]}{'...' if len(theory_cols) > 5 else ''}")
     print(f"Practical columns: {practical_cols}")
 
+    # Header parsing is constant per column, so resolve every column once up front
+    max_marks_by_col = {}
+    for col in all_subject_cols:
+        max_marks_by_col[col] = extract_max_marks_from_header(col)
+        print(f"    Using detected max marks: {col} -> {max_marks_by_col[col]}")
+
     def extract_max_marks(col_name):
-        marks = extract_max_marks_from_header(col_name)
-        print(f"    Using detected max marks: {col_name} -> {marks}")
-        return marks
+        return max_marks_by_col[col_name]
 
     print(f"\n1️⃣ Calculating Academic Performance %...")
     if all_subject_cols:
-        academic_performance_list = []
-        for row_idx in range(len(df)):
-            total_obtained = 0
-            total_maximum = 0
-            for col in all_subject_cols:
-                obtained_marks = safe_get_value(df, row_idx, col)
-                max_marks = extract_max_marks(col)
-                if is_valid_number(obtained_marks):
-                    total_obtained += float(obtained_marks)
-                    total_maximum += max_marks
-            if total_maximum > 0:
-                percentage = (total_obtained / total_maximum) * 100
-                academic_performance_list.append(round(percentage, 2))
-            else:
-                academic_performance_list.append(0)
-        df['Academic_Performance_%'] = academic_performance_list
+        df['Academic_Performance_%'] = _batch_row_percentage(df, all_subject_cols, max_marks_by_col)
         print(f"✅ Academic Performance calculated using sum method for {len(df)} students")
         if len(df) > 0:
             first_student_obtained = 0
@@ -177,7 +229,6 @@ def calculate_performance_metrics(df):
 
     print(f"\n3️⃣ Calculating Practical % (Only identified PRACTICAL/PR columns)...")
     if practical_cols:
-        practical_performance_list = []
         print(f"🔍 Practical calculation details:")
         total_practical_max_possible = 0
         for col in practical_cols:
@@ -185,21 +236,7 @@ def calculate_performance_metrics(df):
             total_practical_max_possible += max_marks
             print(f"  ✅ {col}: Max marks = {max_marks}")
         print(f"📊 Total maximum practical marks possible: {total_practical_max_possible}")
-        for row_idx in range(len(df)):
-            practical_obtained = 0
-            practical_maximum = 0
-            for col in practical_cols:
-                obtained_marks = safe_get_value(df, row_idx, col)
-                max_marks = extract_max_marks(col)
-                if is_valid_number(obtained_marks):
-                    practical_obtained += float(obtained_marks)
-                    practical_maximum += max_marks
-            if practical_maximum > 0:
-                percentage = (practical_obtained / practical_maximum) * 100
-                practical_performance_list.append(round(percentage, 2))
-            else:
-                practical_performance_list.append(0)
-        df['Practical_%'] = practical_performance_list
+        df['Practical_%'] = _batch_row_percentage(df, practical_cols, max_marks_by_col)
         print(f"✅ Practical Performance calculated for {len(df)} students using identified PRACTICAL/PR columns only")
         if len(df) > 0:
             first_student_practical = 0
@@ -219,7 +256,7 @@ def calculate_performance_metrics(df):
                 print(f"    Total practical obtained: {first_student_practical}")
                 print(f"    Total practical maximum: {first_student_practical_max}")
                 print(f"    Practical percentage: {(first_student_practical/first_student_practical_max)*100:.2f}%")
-        excluded_cols = [col for col in all_subject_cols if not is_practical_column(col) and any(keyword in str(col).upper() for keyword in ['TW', 'ENVIRONMENTAL', 'ENGINEERING']) and 'PR' not in str(col).upper()]
+        excluded_cols = [col for col in all_subject_cols if not is_practical_column(col) and any(keyword in upper_cols[col] for keyword in ['TW', 'ENVIRONMENTAL', 'ENGINEERING']) and 'PR' not in upper_cols[col]]
         if excluded_cols:
             print(f"❌ Columns EXCLUDED from Practical % calculation:")
             for col in excluded_cols:
@@ -302,15 +339,14 @@ def process_excel_file(uploaded_file):
     try:
         file_obj = io.BytesIO(uploaded_file.getvalue())
 
-        data_start_row = find_data_start_row(file_obj, sheet_name=0)
-        print(f"Data starts at row: {data_start_row}")
-
-        file_obj.seek(0)
-        wb = load_workbook(file_obj)
+        # Load the workbook once and share it between the header scans
+        wb = load_workbook(file_obj, data_only=True)
         ws = wb.active
 
-        file_obj.seek(0)
-        subjects_info = extract_subject_info(file_obj, sheet_name=0)
+        data_start_row = find_data_start_row(file_obj, sheet_name=0, wb=wb)
+        print(f"Data starts at row: {data_start_row}")
+
+        subjects_info = extract_subject_info(file_obj, sheet_name=0, wb=wb)
         print(f"Extracted subjects: {subjects_info}")
 
         header_rows = []
@@ -324,7 +360,7 @@ def process_excel_file(uploaded_file):
         print(f"Header rows: {header_rows}")
 
         file_obj.seek(0)
-        df = pd.read_excel(file_obj, sheet_name=0, skiprows=data_start_row + 3, header=None)
+        df = pd.read_excel(file_obj, sheet_name=0, skiprows=data_start_row + 3, header=None, engine=EXCEL_ENGINE)
         df = df.dropna(axis=1, how='all')
         df = df.dropna(axis=0, how='all')
         print(f"DataFrame shape after reading: {df.shape}")
@@ -452,6 +488,9 @@ def process_excel_file(uploaded_file):
         category_dist = df['Category'].value_counts()
         print(f"📊 Student Classification Results (Grade Graph): {dict(category_dist)}")
 
+        df = downcast_numeric_columns(df)
+        df = categorize_label_columns(df)
+
         suggestion_columns = ['SR.No', 'Roll No', 'Name', 'Category']
         performance_cols = ['Academic_Performance_%', 'Previous_Performance_Analysis', 'Practical_%', 'Coding_Expertise', 'Performance_Analysis']
         for col in performance_cols:
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -7,29 +8,32 @@ def get_student_performance(df, student_identifier):
         if not search_term:
             return None
         print(f"🔍 Searching for student: '{search_term}'")
-        student_row = None
+        # Work with match positions so no intermediate dataframe is materialised
+        student_idx = None
         if search_term.isdigit():
             print("  → Searching by numeric ID...")
             if 'SR.No' in df.columns:
-                sr_matches = df[df['SR.No'].astype(str).str.strip() == search_term]
-                if not sr_matches.empty:
-                    student_row = sr_matches
+                sr_matches = np.flatnonzero((df['SR.No'].astype(str).str.strip() == search_term).to_numpy(dtype=bool))
+                if len(sr_matches) > 0:
+                    student_idx = sr_matches[0]
                     print(f"  ✅ Found by SR.No: {len(sr_matches)} matches")
-            if student_row is None or student_row.empty:
+            if student_idx is None:
                 if 'Roll No' in df.columns:
-                    roll_matches = df[df['Roll No'].astype(str).str.strip() == search_term]
-                    if not roll_matches.empty:
-                        student_row = roll_matches
+                    roll_matches = np.flatnonzero((df['Roll No'].astype(str).str.strip() == search_term).to_numpy(dtype=bool))
+                    if len(roll_matches) > 0:
+                        student_idx = roll_matches[0]
                         print(f"  ✅ Found by Roll No: {len(roll_matches)} matches")
-        if student_row is None or student_row.empty:
+        if student_idx is None:
             print("  → Searching by name...")
             if 'Name' in df.columns:
-                name_matches = df[df['Name'].astype(str).str.contains(search_term, case=False, na=False)]
-                if not name_matches.empty:
-                    student_row = name_matches
+                name_matches = np.flatnonzero(
+                    df['Name'].astype(str).str.contains(search_term, case=False, na=False, regex=False).to_numpy(dtype=bool)
+                )
+                if len(name_matches) > 0:
+                    student_idx = name_matches[0]
                     print(f"  ✅ Found by Name: {len(name_matches)} matches")
-        if student_row is not None and not student_row.empty:
-            result = student_row.iloc[0].to_dict()
+        if student_idx is not None:
+            result = df.iloc[student_idx].to_dict()
             print(f"  ✅ Returning student: {result.get('Name', 'Unknown')}")
             return result
         else:
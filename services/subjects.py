@@ -1,23 +1,29 @@
+import numpy as np
 import pandas as pd
 
+METADATA_COLUMNS = ['SR.No', 'Roll No', 'Name', 'Academic_Performance_%', 'Previous_Performance_Analysis',
+                    'Practical_%', 'Coding_Expertise', 'Performance_Analysis', 'Category']
+
 
 def get_subject_list(df):
-    exclude_cols = ['SR.No', 'Roll No', 'Name', 'Academic_Performance_%', 'Previous_Performance_Analysis',
-                   'Practical_%', 'Coding_Expertise', 'Performance_Analysis', 'Category']
+    return get_subject_list_from_columns(df.columns)
 
-    subject_cols = [col for col in df.columns if col not in exclude_cols]
+
+def get_subject_list_from_columns(columns):
+    """
+    Subject names found in a sequence of column headers
+    """
+    subject_cols = [col for col in columns if col not in METADATA_COLUMNS]
 
     subjects = set()
     for col in subject_cols:
-        col_str = str(col)
+        col_upper = str(col).upper()
         for assessment in ['ISE', 'MSE', 'ESE', 'PRACTICAL', 'TW', 'PR']:
-            if assessment in col_str.upper():
-                parts = col_str.upper().split(assessment)
-                if len(parts) > 0:
-                    subject_name = parts[0].strip()
-                    if subject_name:
-                        subject_name = subject_name.replace('_', ' ').title()
-                        subjects.add(subject_name)
+            if assessment in col_upper:
+                subject_name = col_upper.split(assessment, 1)[0].strip()
+                if subject_name:
+                    subject_name = subject_name.replace('_', ' ').title()
+                    subjects.add(subject_name)
                 break
 
     subject_list = sorted(list(subjects))
@@ -27,9 +33,9 @@ def get_subject_list(df):
 
 def get_subject_exam_types(df, subject_name):
     exam_types = set()
+    subject_upper = subject_name.upper()
     for col in df.columns:
         col_upper = str(col).upper()
-        subject_upper = subject_name.upper()
         if subject_upper in col_upper:
             if 'ESE' in col_upper:
                 exam_types.add('ESE')
@@ -47,12 +53,12 @@ def get_subject_exam_types(df, subject_name):
 def get_subject_marks(df, subject_name):
     """
     Calculate total marks (MSE + ESE) for a given subject
-    Returns the sum of MSE and ESE marks for each student
+    Returns an array with the sum of MSE and ESE marks for each student
     """
     subject_cols = []
+    subject_upper = subject_name.upper()
     for col in df.columns:
         col_upper = str(col).upper()
-        subject_upper = subject_name.upper()
         if subject_upper in col_upper:
             # Only include MSE and ESE columns
             if 'MSE' in col_upper or 'ESE' in col_upper:
@@ -61,36 +67,25 @@ def get_subject_marks(df, subject_name):
     if not subject_cols:
         return None
     
-    # Calculate total marks for each student
-    marks_data = []
-    for _, row in df.iterrows():
-        total_marks = 0
-        for col in subject_cols:
-            try:
-                marks = float(row[col]) if pd.notna(row[col]) else 0
-                total_marks += marks
-            except (ValueError, TypeError):
-                continue
-        marks_data.append(total_marks)
-    
-    return marks_data
+    # Sum the marks block per student; blank or non-numeric cells count as 0
+    marks_block = df.loc[:, subject_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    return np.nansum(marks_block, axis=1)
 
 
-def get_subject_marks_summary(df, subject_name):
+def get_subject_marks_summary(df, subject_name, marks_data=None):
     """
     Get summary statistics for subject marks (MSE + ESE)
+    Pass marks_data when the totals were already computed with get_subject_marks
     """
-    marks_data = get_subject_marks(df, subject_name)
+    if marks_data is None:
+        marks_data = get_subject_marks(df, subject_name)
     if marks_data is None:
         return None
     
-    import numpy as np
     return {
         'total_marks': marks_data,
-        'average_marks': np.mean(marks_data),
-        'max_marks': np.max(marks_data),
-        'min_marks': np.min(marks_data),
-        'std_marks': np.std(marks_data)
+        'average_marks': np.nanmean(marks_data),
+        'max_marks': np.nanmax(marks_data),
+        'min_marks': np.nanmin(marks_data),
+        'std_marks': np.nanstd(marks_data)
     }
-
-
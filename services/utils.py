@@ -2,12 +2,21 @@ import re
 import pandas as pd
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
 
 # Set up logging for debugging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Header patterns that mark a column as practical even without a keyword match
+_PRACTICAL_PATTERNS = [
+    re.compile(r'\s+PR\s*$'),
+    re.compile(r'\s+PR\s*\('),
+    re.compile(r'PR\)\s*$'),
+    re.compile(r'\bPR\s*\(\d+\)'),
+]
+
 class DynamicMarksExtractor:
     def __init__(self, config_file_path=None):
         """
@@ -145,15 +154,8 @@ class DynamicMarksExtractor:
                 return True
 
         # Additional pattern-based checking
-        practical_patterns = [
-            r'\s+PR\s*$',
-            r'\s+PR\s*\(',
-            r'PR\)\s*$',
-            r'\bPR\s*\(\d+\)',
-        ]
-
-        for pattern in practical_patterns:
-            if re.search(pattern, col_upper):
+        for pattern in _PRACTICAL_PATTERNS:
+            if pattern.search(col_upper):
                 return True
 
         # Exclude TW columns that don't have PR
@@ -329,6 +331,7 @@ def create_marks_extractor(config_file_path=None):
 # Module-level singleton extractor and wrappers for legacy imports
 _default_extractor = DynamicMarksExtractor()
 
+@lru_cache(maxsize=None)
 def extract_max_marks_from_header(col_name):
     return _default_extractor.extract_marks_from_header(col_name)
 